@@ -2,9 +2,12 @@
 
 from __future__ import annotations
 
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
+import orjson
 from pydantic import BaseModel, Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -27,6 +30,10 @@ class LLMSettings(BaseModel):
         ),
         description="System prompt prepended to every conversation",
     )
+    resend_prior_images: bool = Field(
+        default=False,
+        description="Inline every image in the history on each turn, not only the latest user message's",
+    )
 
 
 class AudioSettings(BaseModel):
@@ -49,6 +56,8 @@ class WhisperSettings(BaseModel):
     device: str = Field(default="cuda")
     compute_type: str = Field(default="float16")
     download_root: Optional[Path] = None
+    language: Optional[str] = Field(default=None, description="Spoken language code; None auto-detects")
+    beam_size: int = Field(default=1, ge=1, description="Decoder beam width; 1 is greedy decoding")
 
 
 class AppSettings(BaseSettings):
@@ -68,22 +77,71 @@ class AppSettings(BaseSettings):
     media_root: Path = Field(default=REPO_ROOT / "backend" / "data" / "media")
 
 
-# A module-level cache for the settings instance provides a clearer singleton pattern.
-_settings_instance: AppSettings | None = None
+@dataclass(frozen=True, slots=True)
+class RuntimeConfig:
+    """Flat snapshot of the settings read on hot audio/streaming paths.
+
+    ``get_runtime_config().media_root`` is the one accessor for the media root outside startup.
+    """
+
+    vad_silence_ms: int
+    enable_voice_output: bool
+    output_volume: float
+    kokoro_voice: str
+    media_root: Path
+
+    @classmethod
+    def from_settings(cls, settings: AppSettings) -> RuntimeConfig:
+        return cls(
+            vad_silence_ms=settings.audio.vad_silence_ms,
+            enable_voice_output=settings.audio.enable_voice_output,
+            output_volume=settings.audio.output_volume,
+            kokoro_voice=settings.audio.kokoro_voice,
+            media_root=settings.media_root,
+        )
+
+
+# Patched settings live here; get_settings falls back to loading from the environment.
+_settings_override: AppSettings | None = None
 
 
+@lru_cache(maxsize=1)
 def get_settings() -> AppSettings:
     """Singleton accessor for settings."""
-    global _settings_instance
-    if _settings_instance is None:
-        _settings_instance = AppSettings()
-    return _settings_instance
+    return _settings_override if _settings_override is not None else AppSettings()
+
+
+@lru_cache(maxsize=1)
+def get_runtime_config() -> RuntimeConfig:
+    """Return the hot-path settings snapshot, rebuilt whenever settings are patched."""
+    return RuntimeConfig.from_settings(get_settings())
+
+
+@lru_cache(maxsize=1)
+def get_settings_json() -> bytes:
+    """Return the current settings pre-serialized as JSON, rebuilt whenever settings are patched."""
+    return orjson.dumps(get_settings().model_dump(mode="json"))
+
+
+def _deep_merge(base: dict, patch: dict) -> dict:
+    merged = dict(base)
+    for key, value in patch.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = _deep_merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
 
 
 def patch_settings(data: dict) -> AppSettings:
     """Apply a partial update to application settings at runtime."""
-    global _settings_instance
+    global _settings_override
     current = get_settings()
-    new_settings = current.model_copy(update=data)
-    _settings_instance = new_settings
+    # The UI patches nested sections ({"audio": {...}}); merge them into the current values and validate
+    # the result so sections stay models. A malformed patch raises here and leaves every cache untouched.
+    new_settings = AppSettings.model_validate(_deep_merge(current.model_dump(), data))
+    _settings_override = new_settings
+    get_settings.cache_clear()
+    get_runtime_config.cache_clear()
+    get_settings_json.cache_clear()
     return new_settings
\ No newline at end of file
@@ -52,20 +52,7 @@ def create_app() -> FastAPI:
 
     app.add_middleware(
         CORSMiddleware,
-        allow_origins=[
-            "http://localhost",
-            "http://localhost:8000",
-            "http://localhost:8080",
-            "https://localhost",
-            "https://localhost:8000",
-            "https://localhost:8080",
-            "http://127.0.0.1",
-            "http://127.0.0.1:8000",
-            "http://127.0.0.1:8080",
-            "https://127.0.0.1",
-            "https://127.0.0.1:8000",
-            "https://127.0.0.1:8080",
-        ],
+        allow_origin_regex=r"^https?://(localhost|127\.0\.0\.1)(:\d+)?$",
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
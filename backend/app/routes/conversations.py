@@ -2,61 +2,88 @@
 
 from __future__ import annotations
 
+import asyncio
+import os
+import shutil
 from pathlib import Path
 
-from fastapi import APIRouter, HTTPException
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Response
 
-from ..config import get_settings
+from ..config import AppSettings, RuntimeConfig, get_runtime_config, get_settings
 from ..services import conversations as convo_service
 from ..services.conversations import delete_all_conversations
+from ..services.streaming import get_streaming_coordinator
 
 router = APIRouter(prefix="/api/conversations", tags=["conversations"])
 
 
-async def _remove_media_for_conversation(conversation_id: str) -> None:
-    settings = get_settings()
-    media_root = settings.media_root
+def _json_response(payload: object) -> Response:
+    # orjson serializes the slotted DTO dataclasses natively, skipping FastAPI's encoder.
+    return Response(content=orjson.dumps(payload), media_type="application/json")
+
+
+def _unlink_many(paths: list[Path], reply_audio: list[Path], output_dir: Path) -> None:
+    for path in paths:
+        # Attempt the unlink directly; a missing file is as good as a deleted one.
+        try:
+            os.unlink(path)
+        except OSError:
+            continue
+    # Streamed replies keep their per-sentence clips in a directory named after the merged WAV.
+    # Only recurse into directories that sit directly in the TTS output dir.
+    output_dir = output_dir.resolve()
+    for audio_path in reply_audio:
+        clip_dir = audio_path.with_suffix("")
+        if audio_path.suffix == ".wav" and clip_dir.resolve().parent == output_dir:
+            shutil.rmtree(clip_dir, ignore_errors=True)
+
+
+async def _remove_media_for_conversation(conversation_id: str, media_root: Path, output_dir: Path) -> None:
     conversation = await convo_service.get_conversation_with_messages(conversation_id)
     if not conversation:
         return
-    for message in conversation["messages"]:
-        for path_attr in (message.get("audio_path"), message.get("image_path")):
-            if not path_attr:
-                continue
-            absolute = media_root / path_attr
-            if absolute.exists():
-                try:
-                    absolute.unlink()
-                except OSError:
-                    continue
+    paths = [
+        media_root / path_attr
+        for message in conversation.messages
+        for path_attr in (message.audio_path, message.image_path)
+        if path_attr
+    ]
+    reply_audio = [
+        media_root / message.audio_path
+        for message in conversation.messages
+        if message.role == "assistant" and message.audio_path
+    ]
+    if paths:
+        await asyncio.to_thread(_unlink_many, paths, reply_audio, output_dir)
 
 
 @router.get("")
-async def list_conversations() -> list[dict[str, str]]:
+async def list_conversations() -> Response:
     """Return available conversations."""
 
-    return await convo_service.list_conversation_dtos()
+    return _json_response(await convo_service.list_conversation_dtos())
 
 
 @router.get("/{conversation_id}")
-async def get_conversation(conversation_id: str) -> dict[str, object]:
+async def get_conversation(conversation_id: str) -> Response:
     """Return a conversation transcript."""
 
     conversation = await convo_service.get_conversation_with_messages(conversation_id)
     if conversation is None:
         raise HTTPException(status_code=404, detail="Conversation not found")
-    return conversation
+    return _json_response(conversation)
 
 
 @router.post("")
-async def create_conversation(payload: dict[str, str]) -> dict[str, object]:
+async def create_conversation(payload: dict[str, str]) -> Response:
     title = payload.get("title", "New Conversation")
     conversation = await convo_service.create_conversation(title=title)
-    return convo_service.serialize_conversation(conversation)
+    return _json_response(convo_service.serialize_conversation(conversation))
 
 
 @router.patch("/{conversation_id}")
-async def rename_conversation(conversation_id: str, payload: dict[str, str]) -> dict[str, object]:
+async def rename_conversation(conversation_id: str, payload: dict[str, str]) -> Response:
     title = payload.get("title")
     if not title:
         raise HTTPException(status_code=400, detail="Title is required")
@@ -65,32 +92,30 @@ async def rename_conversation(conversation_id: str, payload: dict[str, str]) ->
         raise HTTPException(status_code=404, detail="Conversation not found")
     conversation = await convo_service.get_conversation_with_messages(conversation_id)
     assert conversation is not None
-    return conversation
+    return _json_response(conversation)
 
 
 @router.delete("/{conversation_id}")
-async def remove_conversation(conversation_id: str) -> dict[str, str]:
-    conversation = await convo_service.get_conversation_with_messages(conversation_id)
-    if conversation is None:
-        raise HTTPException(status_code=404, detail="Conversation not found")
-    await _remove_media_for_conversation(conversation_id)
+async def remove_conversation(
+    conversation_id: str,
+    settings: AppSettings = Depends(get_settings),
+    runtime: RuntimeConfig = Depends(get_runtime_config),
+) -> dict[str, str]:
+    # Media cleanup is a no-op for an unknown id; the delete's rowcount decides the 404.
+    await _remove_media_for_conversation(conversation_id, runtime.media_root, settings.audio.output_dir)
     deleted = await convo_service.delete_conversation(conversation_id)
+    (await get_streaming_coordinator()).forget_conversation(conversation_id)
     if not deleted:
         raise HTTPException(status_code=404, detail="Conversation not found")
     return {"status": "deleted"}
 
 
 @router.delete("")
-async def remove_all_conversations() -> dict[str, str]:
-    settings = get_settings()
-    media_root = settings.media_root
-    if media_root.exists():
-        for path in list(media_root.rglob("*")):
-            if path.is_file():
-                try:
-                    path.unlink()
-                except OSError:
-                    continue
+async def remove_all_conversations(runtime: RuntimeConfig = Depends(get_runtime_config)) -> dict[str, str]:
+    media_root = runtime.media_root
+    await asyncio.to_thread(shutil.rmtree, media_root, ignore_errors=True)
+    media_root.mkdir(parents=True, exist_ok=True)
     await delete_all_conversations()
+    (await get_streaming_coordinator()).forget_conversation()
     return {"status": "cleared"}
 
@@ -6,32 +6,35 @@ import logging
 import secrets
 from pathlib import Path
 
-from fastapi import APIRouter, HTTPException, UploadFile
+import aiofiles
+from fastapi import APIRouter, Depends, HTTPException, UploadFile
 
-from ..config import get_settings
+from ..config import RuntimeConfig, get_runtime_config
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/media", tags=["media"])
 
+_UPLOAD_CHUNK_SIZE = 1 << 20
 
-async def _save_upload(file: UploadFile, subdir: str) -> Path:
-    settings = get_settings()
+
+async def _save_upload(file: UploadFile, subdir: str, media_root: Path) -> Path:
     sub_path = Path(subdir)
-    target_dir = settings.media_root / sub_path
+    target_dir = media_root / sub_path
     target_dir.mkdir(parents=True, exist_ok=True)
     suffix = Path(file.filename or "upload").suffix or ".bin"
     name = secrets.token_hex(8) + suffix
     relative_path = sub_path / name
-    destination = settings.media_root / relative_path
-    content = await file.read()
-    destination.write_bytes(content)
+    destination = media_root / relative_path
+    async with aiofiles.open(destination, "wb") as out:
+        while chunk := await file.read(_UPLOAD_CHUNK_SIZE):
+            await out.write(chunk)
     return relative_path
 
 
 @router.post("/images")
-async def upload_image(file: UploadFile) -> dict[str, str]:
-    relative = await _save_upload(file, "images")
+async def upload_image(file: UploadFile, runtime: RuntimeConfig = Depends(get_runtime_config)) -> dict[str, str]:
+    relative = await _save_upload(file, "images", runtime.media_root)
     return {
         "path": f"/media/{relative.as_posix()}",
         "relative_path": relative.as_posix(),
@@ -39,9 +42,9 @@ async def upload_image(file: UploadFile) -> dict[str, str]:
 
 
 @router.post("/audio")
-async def upload_audio(file: UploadFile) -> dict[str, str]:
+async def upload_audio(file: UploadFile, runtime: RuntimeConfig = Depends(get_runtime_config)) -> dict[str, str]:
     try:
-        relative = await _save_upload(file, "audio/input")
+        relative = await _save_upload(file, "audio/input", runtime.media_root)
     except Exception as exc:  # noqa: BLE001
         logger.exception("Failed to save uploaded audio: %s", exc)
         raise HTTPException(status_code=500, detail="Failed to store audio") from exc
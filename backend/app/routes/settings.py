@@ -2,19 +2,19 @@
 
 from __future__ import annotations
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 
-from ..config import AppSettings, get_settings, patch_settings
+from ..config import AppSettings, get_settings_json, patch_settings
 
 
 router = APIRouter(prefix="/api/settings", tags=["settings"])
 
 
-@router.get("")
-async def read_settings() -> AppSettings:
+@router.get("", response_model=AppSettings)
+async def read_settings(settings_json: bytes = Depends(get_settings_json)) -> Response:
     """Return current application settings."""
 
-    return get_settings()
+    return Response(content=settings_json, media_type="application/json")
 
 
 @router.patch("")
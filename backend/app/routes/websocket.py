@@ -2,79 +2,119 @@
 
 from __future__ import annotations
 
+import asyncio
+from contextlib import aclosing
 from pathlib import Path
+from typing import AsyncIterator
 
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+import orjson
+from fastapi import APIRouter, Depends, WebSocket, WebSocketDisconnect
 
-from ..config import get_settings
-from ..services.streaming import get_streaming_coordinator
+from ..config import RuntimeConfig, get_runtime_config
+from ..services.streaming import StreamingChunk, get_streaming_coordinator
 
 
 router = APIRouter(prefix="/ws", tags=["realtime"])
 
+_dumps = orjson.dumps
+_loads = orjson.loads
+
+
+async def _pump_outbound(socket: WebSocket, outbound: asyncio.Queue[bytes]) -> None:
+    # Sole writer for the socket, so frames from background tasks never interleave with a reply.
+    try:
+        while True:
+            await socket.send_bytes(await outbound.get())
+    except (WebSocketDisconnect, RuntimeError, OSError):
+        # The client went away; the receive loop notices on its own and ends the handler.
+        return
+
 
 @router.websocket("/chat")
-async def chat_socket(socket: WebSocket) -> None:
+async def chat_socket(socket: WebSocket, runtime: RuntimeConfig = Depends(get_runtime_config)) -> None:
     """Handle realtime chat interactions."""
 
     await socket.accept()
+    media_root = runtime.media_root
+    coordinator = await get_streaming_coordinator()
+    outbound: asyncio.Queue[bytes] = asyncio.Queue()
+    writer = asyncio.create_task(_pump_outbound(socket, outbound))
+
+    def send(message: dict) -> None:
+        if not writer.done():
+            outbound.put_nowait(_dumps(message))
+
+    def send_chunk(chunk: StreamingChunk) -> None:
+        send({"type": chunk.type, "data": chunk.data})
+
+    async def relay(stream: AsyncIterator[StreamingChunk]) -> None:
+        # Sends never fail here, so watch the writer: once it has died the client is gone, and closing
+        # the stream right away cancels the remaining LLM and TTS work and saves the user's turn.
+        async with aclosing(stream):
+            async for chunk in stream:
+                if writer.done():
+                    raise WebSocketDisconnect()
+                send_chunk(chunk)
+
     try:
         while True:
-            payload = await socket.receive_json()
+            payload = _loads(await socket.receive_text())
 
             conversation_id = payload.get("conversation_id")
             message_type = payload.get("type")
             if conversation_id is None or message_type is None:
-                await socket.send_json({"error": "invalid_payload"})
+                send({"error": "invalid_payload"})
                 continue
 
-            coordinator = await get_streaming_coordinator()
-
             if message_type == "text":
                 text = payload.get("text", "")
                 image_ref = payload.get("image_path")
                 image_path = None
                 stored_image_path = None
                 if image_ref:
-                    settings = get_settings()
                     raw_image = Path(image_ref)
                     if raw_image.is_absolute():
                         image_path = raw_image
                         try:
-                            stored_image_path = raw_image.relative_to(settings.media_root).as_posix()
+                            stored_image_path = raw_image.relative_to(media_root).as_posix()
                         except ValueError:
                             stored_image_path = raw_image.as_posix()
                     else:
-                        image_path = settings.media_root / raw_image
+                        image_path = media_root / raw_image
                         stored_image_path = raw_image.as_posix()
-                async for chunk in coordinator.handle_text_message(
-                    conversation_id,
-                    text,
-                    image_path=image_path,
-                    stored_image_path=stored_image_path,
-                ):
-                    await socket.send_json({"type": chunk.type, "data": chunk.data})
+                await relay(
+                    coordinator.handle_text_message(
+                        conversation_id,
+                        text,
+                        image_path=image_path,
+                        stored_image_path=stored_image_path,
+                        on_title=send_chunk,
+                    )
+                )
             elif message_type == "audio":
                 audio_ref = payload.get("audio_path")
                 if not audio_ref:
-                    await socket.send_json({"error": "missing_audio_path"})
+                    send({"error": "missing_audio_path"})
                     continue
                 raw_path = Path(audio_ref)
-                settings = get_settings()
                 if raw_path.is_absolute():
                     audio_path = raw_path
-                    relative_path = raw_path.relative_to(settings.media_root) if raw_path.is_relative_to(settings.media_root) else raw_path
+                    relative_path = raw_path.relative_to(media_root) if raw_path.is_relative_to(media_root) else raw_path
                 else:
-                    audio_path = settings.media_root / raw_path
+                    audio_path = media_root / raw_path
                     relative_path = raw_path
-                async for chunk in coordinator.handle_voice_message(
-                    conversation_id,
-                    audio_path,
-                    stored_audio_path=str(relative_path).replace("\\", "/"),
-                ):
-                    await socket.send_json({"type": chunk.type, "data": chunk.data})
+                await relay(
+                    coordinator.handle_voice_message(
+                        conversation_id,
+                        audio_path,
+                        stored_audio_path=str(relative_path).replace("\\", "/"),
+                        on_title=send_chunk,
+                    )
+                )
             else:
-                await socket.send_json({"error": "unsupported_type"})
+                send({"error": "unsupported_type"})
     except WebSocketDisconnect:
         return
+    finally:
+        writer.cancel()
 
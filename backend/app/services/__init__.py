@@ -2,7 +2,9 @@
 
 from .audio import SpeechService, get_speech_service, shutdown_speech_service
 from .conversations import (
+    NewMessage,
     add_message,
+    add_messages,
     create_conversation,
     delete_conversation,
     get_conversation_with_messages,
@@ -28,6 +30,8 @@ __all__ = [
     "create_conversation",
     "rename_conversation",
     "delete_conversation",
+    "NewMessage",
     "add_message",
+    "add_messages",
     "update_message_audio_path",
 ]
\ No newline at end of file
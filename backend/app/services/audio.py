@@ -6,6 +6,7 @@ import asyncio
 import logging
 import re
 import secrets
+import struct
 from pathlib import Path
 from typing import Optional
 
@@ -14,32 +15,43 @@ import numpy as np
 from faster_whisper import WhisperModel
 from kokoro_onnx import Kokoro
 
-from ..config import get_settings
+from ..config import get_runtime_config, get_settings
 from .vad import VoiceActivityDetector, VADConfig
 
 logger = logging.getLogger(__name__)
 
+_MULTISPACE_RE = re.compile(r" {2,}")
+_STAR_RE = re.compile(r"\*+")
+# Canonical 44-byte PCM WAV header: RIFF chunk, 16-byte fmt chunk, data chunk header.
+_WAV_HEADER = struct.Struct("<4sI4s4sIHHIIHH4sI")
+# Below this many input bytes, encoding inline is cheaper than a thread-pool round trip.
+_INLINE_ENCODE_MAX_BYTES = 32 * 1024
+
 
 class SpeechService:
     """Handles speech-to-text and text-to-speech pipelines."""
 
     def __init__(self) -> None:
         settings = get_settings()
+        runtime = get_runtime_config()
         self._whisper_model: WhisperModel | None = None
         self._kokoro: Kokoro | None = None
-        self._kokoro_voice = settings.audio.kokoro_voice
+        self._initialized = False
         self._onnx_path = settings.audio.kokoro_onnx_path
         self._voices_path = settings.audio.kokoro_voices_path
-        self._enable_voice_output = settings.audio.enable_voice_output
-        self._output_volume = settings.audio.output_volume
         self._input_dir = settings.audio.input_dir
         self._output_dir = settings.audio.output_dir
+        self._whisper_language = settings.whisper.language
+        self._whisper_beam_size = settings.whisper.beam_size
+        # Replies are synthesized sentence by sentence; one Kokoro run at a time keeps them from
+        # fighting over the ONNX runtime's thread pool.
+        self._tts_lock = asyncio.Lock()
         self._vad = VoiceActivityDetector(
             aggressiveness=3,
             config=VADConfig(
                 sample_rate=16000,
                 frame_duration_ms=30,
-                silence_duration_ms=settings.audio.vad_silence_ms,
+                silence_duration_ms=runtime.vad_silence_ms,
             ),
         )
 
@@ -52,15 +64,24 @@ class SpeechService:
                 compute_type=settings.whisper.compute_type,
                 download_root=settings.whisper.download_root,
             )
-        if self._kokoro is None and self._enable_voice_output:
-            self._kokoro = Kokoro(
-                model_path=str(self._onnx_path),
-                voices_path=str(self._voices_path),
-            )
+        if self._kokoro is None and get_runtime_config().enable_voice_output:
+            self._kokoro = self._load_kokoro()
         self._input_dir.mkdir(parents=True, exist_ok=True)
         self._output_dir.mkdir(parents=True, exist_ok=True)
+        self._initialized = True
+
+    def _load_kokoro(self) -> Kokoro:
+        return Kokoro(
+            model_path=str(self._onnx_path),
+            voices_path=str(self._voices_path),
+        )
+
+    @property
+    def output_dir(self) -> Path:
+        return self._output_dir
 
     async def shutdown(self) -> None:
+        self._initialized = False
         if self._kokoro is not None:
             self._kokoro = None
         if self._whisper_model is not None:
@@ -70,82 +91,141 @@ class SpeechService:
         if self._whisper_model is None:
             raise RuntimeError("SpeechService not initialized")
 
-        segments, _ = await asyncio.to_thread(self._whisper_model.transcribe, str(audio_path))
-        transcription = " ".join(segment.text.strip() for segment in segments)
-        return transcription.strip()
+        return await asyncio.to_thread(self._transcribe_sync, self._whisper_model, audio_path)
+
+    def _transcribe_sync(self, model: WhisperModel, audio_path: Path) -> str:
+        segments, _ = model.transcribe(
+            str(audio_path),
+            beam_size=self._whisper_beam_size,
+            language=self._whisper_language,
+            vad_filter=True,
+            condition_on_previous_text=False,
+        )
+        # ``segments`` is lazy; decoding happens while it is consumed, so join it on this thread.
+        return "".join(segment.text for segment in segments).strip()
 
-    async def trim_silence(self, pcm16: bytes) -> bytes:
+    async def trim_silence(self, pcm16: bytes | memoryview) -> memoryview:
         return await asyncio.to_thread(self._vad.trim_silence, pcm16)
 
     async def synthesize_speech(self, text: str, output_path: Optional[Path] = None) -> Optional[Path]:
-        if not self._enable_voice_output:
+        # Voice, volume and the on/off toggle can be patched from the settings UI, so read them per call.
+        runtime = get_runtime_config()
+        if not runtime.enable_voice_output:
             logger.debug("Voice output disabled; skipping synthesis")
             return None
-        if self._kokoro is None:
+        if not self._initialized:
             raise RuntimeError("SpeechService not initialized for TTS")
 
         if output_path is None:
             filename = secrets.token_hex(8) + ".wav"
             output_path = self._output_dir / filename
 
-        normalized_text = text.strip()
-        if "*" in normalized_text:
-            normalized_text = normalized_text.replace("*", "")
-            normalized_text = re.sub(r" {2,}", " ", normalized_text)
+        normalized_text = _MULTISPACE_RE.sub(" ", _STAR_RE.sub("", text.strip()))
         if not normalized_text:
             logger.debug("Skipping synthesis for empty text input")
             return None
 
         logger.debug("Synthesizing speech to %s", output_path)
         try:
-            audio, sample_rate = await asyncio.to_thread(
-                self._kokoro.create,
-                normalized_text,
-                self._kokoro_voice,
-            )
+            async with self._tts_lock:
+                if self._kokoro is None:
+                    # Voice output was switched on after startup.
+                    self._kokoro = await asyncio.to_thread(self._load_kokoro)
+                audio, sample_rate = await asyncio.to_thread(
+                    self._kokoro.create,
+                    normalized_text,
+                    runtime.kokoro_voice,
+                )
         except Exception as exc:  # noqa: BLE001
             logger.exception("Kokoro synthesis failed: %s", exc)
             return None
 
-        if self._output_volume != 1.0:
-            audio = np.clip(audio * self._output_volume, -1.0, 1.0)
-
-        await self._write_wav(output_path, audio, sample_rate=sample_rate)
+        await self._write_wav(output_path, audio, sample_rate=sample_rate, volume=runtime.output_volume)
         logger.debug("Synthesis complete: %s", output_path)
         return output_path
 
-    async def _write_wav(self, output_path: Path, audio: np.ndarray, sample_rate: int = 22050) -> None:
-        import wave
-
+    async def concatenate_wavs(self, paths: list[Path], output_path: Path) -> Path:
+        """Join WAV files written by ``synthesize_speech`` into a single file."""
+        data = await asyncio.to_thread(self._concatenate_wavs_sync, paths)
         output_path.parent.mkdir(parents=True, exist_ok=True)
         async with aiofiles.open(output_path, "wb") as f:
-            # wave module expects synchronous file object; write to buffer first
-            data = await asyncio.to_thread(self._encode_wav, audio, sample_rate)
             await f.write(data)
+        return output_path
 
     @staticmethod
-    def _encode_wav(audio: np.ndarray, sample_rate: int) -> bytes:
-        import io
-        import wave
+    def _concatenate_wavs_sync(paths: list[Path]) -> bytearray:
+        # Every file comes from ``_encode_wav``, so each has the same canonical 44-byte header.
+        header_size = _WAV_HEADER.size
+        parts = [path.read_bytes() for path in paths]
+        fields = list(_WAV_HEADER.unpack_from(parts[0]))
+        data_size = sum(len(part) - header_size for part in parts)
+        fields[1] = 36 + data_size
+        fields[-1] = data_size
+        out = bytearray(_WAV_HEADER.pack(*fields))
+        for part in parts:
+            out += memoryview(part)[header_size:]
+        return out
+
+    async def _write_wav(
+        self,
+        output_path: Path,
+        audio: np.ndarray,
+        sample_rate: int = 22050,
+        volume: float = 1.0,
+    ) -> None:
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        async with aiofiles.open(output_path, "wb") as f:
+            # Encode the whole file in memory, then hand it to aiofiles in one write
+            if audio.nbytes < _INLINE_ENCODE_MAX_BYTES:
+                data = self._encode_wav(audio, sample_rate, volume)
+            else:
+                data = await asyncio.to_thread(self._encode_wav, audio, sample_rate, volume)
+            await f.write(data)
 
-        buffer = io.BytesIO()
-        with wave.open(buffer, "wb") as wav_file:
-            wav_file.setnchannels(1)
-            wav_file.setsampwidth(2)
-            wav_file.setframerate(sample_rate)
-            pcm16 = (audio * 32767).astype(np.int16)
-            wav_file.writeframes(pcm16.tobytes())
-        return buffer.getvalue()
+    @staticmethod
+    def _encode_wav(audio: np.ndarray, sample_rate: int, volume: float = 1.0) -> bytes:
+        # Volume and PCM16 scaling share one float32 pass; clipping happens in place.
+        # Kokoro hands back a fresh float32 buffer that nothing else reads, so reuse it as scratch.
+        scale = 32767.0 * volume
+        if audio.dtype == np.float32 and audio.flags.writeable:
+            scaled = np.multiply(audio, scale, out=audio)
+        else:
+            scaled = np.multiply(audio, scale, dtype=np.float32)
+        np.clip(scaled, -32768.0, 32767.0, out=scaled)
+        pcm16 = scaled.astype("<i2")
+
+        data_size = pcm16.nbytes
+        header = _WAV_HEADER.pack(
+            b"RIFF",
+            36 + data_size,
+            b"WAVE",
+            b"fmt ",
+            16,  # fmt chunk size
+            1,  # PCM
+            1,  # mono
+            sample_rate,
+            sample_rate * 2,  # byte rate
+            2,  # block align
+            16,  # bits per sample
+            b"data",
+            data_size,
+        )
+        return header + memoryview(pcm16).cast("B")
 
 
 _speech_service: SpeechService | None = None
+_speech_service_lock = asyncio.Lock()
 
 
 async def get_speech_service() -> SpeechService:
     global _speech_service
     if _speech_service is None:
-        _speech_service = SpeechService()
-        await _speech_service.initialize()
+        # Loading Whisper and Kokoro is slow; concurrent first callers wait for one load.
+        async with _speech_service_lock:
+            if _speech_service is None:
+                service = SpeechService()
+                await service.initialize()
+                _speech_service = service
     return _speech_service
 
 
@@ -2,81 +2,114 @@
 
 from __future__ import annotations
 
-from pathlib import Path
-from typing import Optional
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Optional, Sequence
 from uuid import uuid4
 
-from sqlalchemy import delete, select, update
+from sqlalchemy import Row, delete, insert, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import selectinload
 
-from ..config import get_settings
+from ..config import get_runtime_config
 from ..storage import Conversation, Message, get_db_manager
 
+_CONVERSATION_LIST_LIMIT = 200
+
 
 def _normalize_media_path(path: Optional[str]) -> Optional[str]:
     if not path:
         return None
 
+    if isinstance(path, str) and "\\" not in path and ":" not in path and not path.startswith("/"):
+        # Already a relative POSIX path, which is how every writer stores media.
+        return path
+
     value = str(path).replace("\\", "/")
     if value.startswith("/media/"):
-        value = value[len("/media/") :]
-
-    original_path = Path(path)
-    if original_path.is_absolute():
-        settings = get_settings()
-        try:
-            return original_path.relative_to(settings.media_root).as_posix()
-        except ValueError:
-            # Path lies outside media root; fall back to cleaned string
-            return value
-
-    return value
-
-
-def serialize_conversation(conversation: Conversation) -> dict[str, object]:
-    return {
-        "id": conversation.id,
-        "title": conversation.title,
-        "created_at": conversation.created_at.isoformat(),
-        "updated_at": conversation.updated_at.isoformat(),
-    }
-
-
-def serialize_message(message: Message) -> dict[str, object]:
-    audio_path = _normalize_media_path(message.audio_path)
-    image_path = _normalize_media_path(message.image_path)
-    return {
-        "id": message.id,
-        "role": message.role,
-        "content": message.content,
-        "created_at": message.created_at.isoformat(),
-        "audio_path": audio_path,
-        "image_path": image_path,
-    }
-
-
-async def list_conversation_dtos() -> list[dict[str, object]]:
+        return value[len("/media/") :]
+
+    # Absolute paths under the media root become relative; anything else is kept as cleaned.
+    return value.removeprefix(get_runtime_config().media_root.as_posix().rstrip("/") + "/")
+
+
+@dataclass(slots=True)
+class ConversationDTO:
+    """Conversation summary as sent to the client."""
+
+    id: str
+    title: str
+    created_at: str
+    updated_at: str
+
+
+@dataclass(slots=True)
+class MessageDTO:
+    """Single transcript entry as sent to the client."""
+
+    id: int
+    role: str
+    content: str
+    created_at: str
+    audio_path: Optional[str]
+    image_path: Optional[str]
+
+
+@dataclass(slots=True)
+class ConversationDetailDTO(ConversationDTO):
+    """Conversation summary plus its ordered transcript."""
+
+    messages: list[MessageDTO] = field(default_factory=list)
+
+
+def serialize_conversation(conversation: Conversation) -> ConversationDTO:
+    return ConversationDTO(
+        id=conversation.id,
+        title=conversation.title,
+        created_at=conversation.created_at.isoformat(),
+        updated_at=conversation.updated_at.isoformat(),
+    )
+
+
+def serialize_message(message: Message) -> MessageDTO:
+    return MessageDTO(
+        id=message.id,
+        role=message.role,
+        content=message.content,
+        created_at=message.created_at.isoformat(),
+        audio_path=_normalize_media_path(message.audio_path),
+        image_path=_normalize_media_path(message.image_path),
+    )
+
+
+async def list_conversation_dtos() -> list[ConversationDTO]:
     db = await get_db_manager()
     async with db.session() as session:
-        result = await session.execute(select(Conversation))
-        conversations = result.scalars().all()
-    return [serialize_conversation(convo) for convo in conversations]
+        result = await session.execute(
+            select(Conversation).order_by(Conversation.updated_at.desc()).limit(_CONVERSATION_LIST_LIMIT)
+        )
+        return [serialize_conversation(convo) for convo in result.scalars()]
 
 
-async def get_conversation_with_messages(conversation_id: str) -> Optional[dict[str, object]]:
+async def get_conversation_with_messages(conversation_id: str) -> Optional[ConversationDetailDTO]:
     db = await get_db_manager()
     async with db.session() as session:
-        conversation = await session.get(Conversation, conversation_id)
+        result = await session.execute(
+            select(Conversation)
+            .options(selectinload(Conversation.messages))
+            .where(Conversation.id == conversation_id)
+        )
+        conversation = result.scalar_one_or_none()
         if conversation is None:
             return None
-        await session.refresh(conversation, attribute_names=["messages"])
-        messages = [
-            serialize_message(message)
-            for message in sorted(conversation.messages, key=lambda m: m.created_at)
-        ]
-        return {
-            **serialize_conversation(conversation),
-            "messages": messages,
-        }
+        # Messages arrive ordered by created_at via the relationship definition.
+        return ConversationDetailDTO(
+            id=conversation.id,
+            title=conversation.title,
+            created_at=conversation.created_at.isoformat(),
+            updated_at=conversation.updated_at.isoformat(),
+            messages=[serialize_message(message) for message in conversation.messages],
+        )
 
 
 async def create_conversation(title: Optional[str] = "New Conversation") -> Conversation:
@@ -107,6 +140,57 @@ async def delete_conversation(conversation_id: str) -> bool:
         return result.rowcount > 0
 
 
+@dataclass(slots=True)
+class NewMessage:
+    """A message waiting to be written by ``add_messages``."""
+
+    role: str
+    content: str
+    audio_path: Optional[str] = None
+    image_path: Optional[str] = None
+
+
+# Columns handed back for freshly inserted messages; the rows read like ``Message`` attributes.
+_STORED_MESSAGE_COLUMNS = (
+    Message.id,
+    Message.role,
+    Message.content,
+    Message.created_at,
+    Message.audio_path,
+    Message.image_path,
+)
+
+
+async def add_messages(conversation_id: str, messages: Sequence[NewMessage]) -> list[Row]:
+    """Insert several messages, creating the conversation if needed, in one transaction."""
+    db = await get_db_manager()
+    async with db.session() as session:
+        # Create the parent row if needed, otherwise bump updated_at so the conversation list
+        # (ordered by it) reflects activity.
+        await session.execute(
+            sqlite_insert(Conversation)
+            .values(id=conversation_id, title="New Conversation")
+            .on_conflict_do_update(index_elements=["id"], set_={"updated_at": datetime.utcnow()})
+        )
+        params = [
+            {
+                "conversation_id": conversation_id,
+                "role": message.role,
+                "content": message.content,
+                "audio_path": _normalize_media_path(message.audio_path),
+                "image_path": _normalize_media_path(message.image_path),
+            }
+            for message in messages
+        ]
+        # A Core insert skips ORM instance construction and the identity map; RETURNING supplies the
+        # autoincrement id and created_at default without a refresh.
+        result = await session.execute(
+            insert(Message).returning(*_STORED_MESSAGE_COLUMNS, sort_by_parameter_order=True),
+            params,
+        )
+        return list(result.all())
+
+
 async def add_message(
     conversation_id: str,
     role: str,
@@ -114,36 +198,18 @@ async def add_message(
     *,
     audio_path: Optional[str] = None,
     image_path: Optional[str] = None,
-) -> Message:
-    db = await get_db_manager()
-    async with db.session() as session:
-        conversation = await session.get(Conversation, conversation_id)
-        if conversation is None:
-            conversation = Conversation(id=conversation_id, title="New Conversation")
-            session.add(conversation)
-        normalized_audio_path = _normalize_media_path(audio_path)
-        normalized_image_path = _normalize_media_path(image_path)
-
-        message = Message(
-            conversation_id=conversation.id,
-            role=role,
-            content=content,
-            audio_path=normalized_audio_path,
-            image_path=normalized_image_path,
-        )
-        session.add(message)
-        await session.flush()
-        await session.refresh(message)
-        return message
+) -> Row:
+    new_message = NewMessage(role=role, content=content, audio_path=audio_path, image_path=image_path)
+    (message,) = await add_messages(conversation_id, [new_message])
+    return message
 
 
 async def update_message_audio_path(message_id: int, audio_path: str) -> None:
     db = await get_db_manager()
     async with db.session() as session:
-        message = await session.get(Message, message_id)
-        if message is None:
-            return
-        message.audio_path = _normalize_media_path(audio_path)
+        await session.execute(
+            update(Message).where(Message.id == message_id).values(audio_path=_normalize_media_path(audio_path))
+        )
 
 
 async def delete_all_conversations() -> None:
@@ -2,16 +2,36 @@
 
 from __future__ import annotations
 
-import json
 import logging
 from typing import AsyncIterator
 
 import httpx
+import orjson
 
 from ..config import get_settings
 
 logger = logging.getLogger(__name__)
 
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+async def _aiter_byte_lines(response: httpx.Response) -> AsyncIterator[bytes]:
+    """Yield newline-delimited lines from a streamed response without decoding them to str."""
+    buffer = bytearray()
+    # aiter_bytes rather than aiter_raw: raw chunks would skip gzip/deflate decoding.
+    async for chunk in response.aiter_bytes():
+        buffer += chunk
+        start = 0
+        # Slicing the memoryview copies each line once; the view is released before the buffer is trimmed.
+        with memoryview(buffer) as view:
+            while (newline := buffer.find(b"\n", start)) >= 0:
+                end = newline - 1 if newline > start and buffer[newline - 1] == 0x0D else newline
+                yield bytes(view[start:end])
+                start = newline + 1
+        del buffer[:start]
+    if buffer:
+        yield bytes(buffer.rstrip(b"\r"))
+
 
 class LLMClient:
     """Client for streaming chat completions from LLM or OpenAI-compatible endpoints."""
@@ -21,7 +41,22 @@ class LLMClient:
         self._base_url = settings.LLM.host.rstrip("/")
         self._model = settings.LLM.model
         self._system_prompt = settings.LLM.system_prompt
-        self._client = httpx.AsyncClient(timeout=120.0, follow_redirects=True)
+        # Limits must live on the transport: httpx ignores client-level limits once a transport is given.
+        transport = httpx.AsyncHTTPTransport(
+            http2=True,
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=32, keepalive_expiry=60),
+            retries=1,
+        )
+        self._client = httpx.AsyncClient(
+            timeout=httpx.Timeout(120.0, connect=5.0),
+            follow_redirects=True,
+            transport=transport,
+        )
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Shared pooled HTTP client for any request to the LLM host."""
+        return self._client
 
     async def close(self) -> None:
         await self._client.aclose()
@@ -51,19 +86,22 @@ class LLMClient:
 
     async def _stream_openai(self, payload: dict) -> AsyncIterator[dict[str, str]]:
         url = f"{self._base_url}/v1/chat/completions"
-        async with self._client.stream("POST", url, json=payload) as response:
+        async with self._client.stream(
+            "POST", url, content=orjson.dumps(payload), headers=_JSON_HEADERS
+        ) as response:
             response.raise_for_status()
-            async for raw_line in response.aiter_lines():
+            async for raw_line in _aiter_byte_lines(response):
                 if not raw_line:
                     continue
-                if raw_line.startswith("data:"):
-                    data = raw_line[len("data:") :].strip()
-                    if data == "[DONE]":
+                if raw_line.startswith(b"data:"):
+                    # SSE allows exactly one optional space after the colon; slice it off instead of strip().
+                    data = raw_line[6:] if raw_line.startswith(b"data: ") else raw_line[5:]
+                    if data == b"[DONE]":
                         yield {"done": True}
                         break
                     try:
-                        message_json = json.loads(data)
-                    except json.JSONDecodeError as exc:  # noqa: BLE001
+                        message_json = orjson.loads(data)
+                    except orjson.JSONDecodeError as exc:  # noqa: BLE001
                         logger.debug("Failed to decode OpenAI chunk: %s", exc)
                         continue
                     choices = message_json.get("choices", [])
@@ -82,12 +120,14 @@ class LLMClient:
             "stream": True,
         }
         url = f"{self._base_url}/api/generate"
-        async with self._client.stream("POST", url, json=payload) as response:
+        async with self._client.stream(
+            "POST", url, content=orjson.dumps(payload), headers=_JSON_HEADERS
+        ) as response:
             response.raise_for_status()
-            async for line in response.aiter_lines():
+            async for line in _aiter_byte_lines(response):
                 if not line:
                     continue
-                chunk = json.loads(line)
+                chunk = orjson.loads(line)
                 if "response" in chunk:
                     yield {"message": {"content": chunk["response"]}}
                 if chunk.get("done"):
@@ -2,13 +2,16 @@
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import logging
-import re
+from collections import OrderedDict
 from typing import Any, Optional
 
 import httpx
 
 from ..config import get_settings
+from .llm import get_llm_client
 
 logger = logging.getLogger(__name__)
 
@@ -16,18 +19,33 @@ _TITLE_INSTRUCTION = (
     "Return only a short conversation title in 2 to 5 plain words. "
     "Do not include explanations, punctuation, quotes, lists, JSON, or reasoning."
 )
+_TITLE_TIMEOUT = 15.0
+_TITLE_LABELS = frozenset({"title", "conversation"})
+_TRIM_CHARS = " \t\n\r\"'`“”„‘’-–—:;,.!?"
+# Caps in-flight title requests across conversations so bursts don't swamp the LLM host.
+_TITLE_SEMAPHORE = asyncio.Semaphore(4)
+# Titles already generated for an exact (user, assistant) pair, keyed by a digest of the pair.
+_TITLE_CACHE_SIZE = 1024
+_title_cache: OrderedDict[str, str] = OrderedDict()
 
 
-async def _make_title_request(url: str, payload: dict[str, Any]) -> dict[str, Any] | None:
+def _title_cache_key(user_message: str, assistant_message: str) -> str:
+    pair = f"{user_message}\x00{assistant_message}".encode()
+    return hashlib.blake2b(pair, digest_size=16).hexdigest()
+
+
+async def _make_title_request(
+    client: httpx.AsyncClient, url: str, payload: dict[str, Any]
+) -> dict[str, Any] | None:
     """Generic helper to make a POST request and handle common errors."""
-    async with httpx.AsyncClient(timeout=15.0) as client:
-        try:
-            response = await client.post(url, json=payload)
-            response.raise_for_status()
-            return response.json()
-        except (httpx.HTTPStatusError, httpx.RequestError, ValueError) as exc:
-            logger.debug("Title generation request to %s failed: %s", url, exc)
-            return None
+    try:
+        async with _TITLE_SEMAPHORE:
+            response = await client.post(url, json=payload, timeout=_TITLE_TIMEOUT)
+        response.raise_for_status()
+        return response.json()
+    except (httpx.HTTPStatusError, httpx.RequestError, ValueError) as exc:
+        logger.debug("Title generation request to %s failed: %s", url, exc)
+        return None
 
 
 async def get_conversation_title(user_message: str, assistant_message: str) -> Optional[str]:
@@ -40,6 +58,21 @@ async def get_conversation_title(user_message: str, assistant_message: str) -> O
     if not user_message or not assistant_message:
         return None
 
+    cache_key = _title_cache_key(user_message, assistant_message)
+    cached = _title_cache.get(cache_key)
+    if cached is not None:
+        _title_cache.move_to_end(cache_key)
+        return cached
+
+    title = await _generate_title(user_message, assistant_message)
+    if title is not None:
+        _title_cache[cache_key] = title
+        while len(_title_cache) > _TITLE_CACHE_SIZE:
+            _title_cache.popitem(last=False)
+    return title
+
+
+async def _generate_title(user_message: str, assistant_message: str) -> Optional[str]:
     settings = get_settings()
     base_url = settings.LLM.host.rstrip("/")
     messages = [
@@ -54,18 +87,25 @@ async def get_conversation_title(user_message: str, assistant_message: str) -> O
         },
     ]
 
-    title = await _request_openai_style_title(base_url, settings.LLM.model, messages)
-    if title is None:
-        title = await _request_LLM_title(base_url, settings.LLM.model, messages)
-    if title is None:
-        title = await _request_LLM_chat_title(base_url, settings.LLM.model, messages)
-    if title is None:
+    client = (await get_llm_client()).client
+    # The endpoint flavours are independent, so race them and keep the first usable title.
+    tasks = [
+        asyncio.create_task(request(client, base_url, settings.LLM.model, messages))
+        for request in (_request_openai_style_title, _request_LLM_title, _request_LLM_chat_title)
+    ]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            title = _sanitize_title(await next_done)
+            if title is not None:
+                return title
         return None
-    return _sanitize_title(title)
+    finally:
+        for task in tasks:
+            task.cancel()
 
 
 async def _request_openai_style_title(
-    base_url: str, model: str, messages: list[dict[str, str]]
+    client: httpx.AsyncClient, base_url: str, model: str, messages: list[dict[str, str]]
 ) -> Optional[str]:
     url = f"{base_url}/v1/chat/completions"
     payload = {
@@ -76,7 +116,7 @@ async def _request_openai_style_title(
         "temperature": 0.5,
         "n": 1,
     }
-    data = await _make_title_request(url, payload)
+    data = await _make_title_request(client, url, payload)
     if not isinstance(data, dict):
         return None
 
@@ -87,11 +127,13 @@ async def _request_openai_style_title(
     return _extract_message_text(message)
 
 
-async def _request_LLM_title(base_url: str, model: str, messages: list[dict[str, str]]) -> Optional[str]:
+async def _request_LLM_title(
+    client: httpx.AsyncClient, base_url: str, model: str, messages: list[dict[str, str]]
+) -> Optional[str]:
     prompt = "\n".join(f"{m['role']}: {m['content']}" for m in messages) + "\nassistant:"
     payload = {"model": model, "prompt": prompt, "stream": False, "options": {"temperature": 0.0}}
     url = f"{base_url}/api/generate"
-    data = await _make_title_request(url, payload)
+    data = await _make_title_request(client, url, payload)
     if not isinstance(data, dict):
         return None
 
@@ -99,11 +141,11 @@ async def _request_LLM_title(base_url: str, model: str, messages: list[dict[str,
 
 
 async def _request_LLM_chat_title(
-    base_url: str, model: str, messages: list[dict[str, str]]
+    client: httpx.AsyncClient, base_url: str, model: str, messages: list[dict[str, str]]
 ) -> Optional[str]:
     payload = {"model": model, "messages": messages, "stream": False, "options": {"temperature": 0.0}}
     url = f"{base_url}/api/chat"
-    data = await _make_title_request(url, payload)
+    data = await _make_title_request(client, url, payload)
     if not isinstance(data, dict):
         return None
 
@@ -128,30 +170,15 @@ def _sanitize_title(raw_title: Optional[str]) -> Optional[str]:
     if not raw_title:
         return None
 
-    title = raw_title.strip()
-    if not title:
-        return None
-
     # Drop leading labels like "Title:" if present.
-    parts = title.split(":", maxsplit=1)
-    if len(parts) == 2 and parts[0].strip().lower() in {"title", "conversation"}:
-        title = parts[1]
+    label, sep, rest = raw_title.partition(":")
+    title = rest if sep and label.strip().lower() in _TITLE_LABELS else raw_title
 
-    title = title.strip().strip("\"'`“”„‘’")
-    title = re.sub(r"[\r\n]+", " ", title)
-    title = re.sub(r"\s+", " ", title)
-    title = title.strip().strip("-–—:;,.!?")
-
-    if not title:
-        return None
-
-    words = title.split()
+    # strip() handles edge whitespace, quotes and punctuation in one pass; split() collapses inner whitespace.
+    words = title.strip(_TRIM_CHARS).split()
     if len(words) < 2:
         return None
-    if len(words) > 5:
-        title = " ".join(words[:5])
-
-    return title
+    return " ".join(words[:5])
 
 
 __all__ = ["get_conversation_title"]
\ No newline at end of file
@@ -2,19 +2,29 @@
 
 from __future__ import annotations
 
-import base64
+import asyncio
 import logging
 import mimetypes
+import re
+import secrets
+import shutil
+from collections import OrderedDict
+from contextlib import aclosing
 from dataclasses import dataclass
+from functools import partial
+from io import StringIO
 from pathlib import Path
-from typing import AsyncIterator, Optional
+from typing import AsyncIterator, Callable, Optional
 
-from ..config import get_settings
+import pybase64
+from sqlalchemy import Row, select
+
+from ..config import AppSettings, get_runtime_config, get_settings
 from ..storage import Conversation, Message, get_db_manager
 from ..utils import clean_llm_text
-from .audio import get_speech_service
+from .audio import SpeechService, get_speech_service
 from .llm import get_llm_client
-from .conversations import add_message, rename_conversation, update_message_audio_path
+from .conversations import NewMessage, add_messages, rename_conversation, update_message_audio_path
 from .llm_naming import get_conversation_title
 
 
@@ -28,16 +38,48 @@ class StreamingChunk:
 
 logger = logging.getLogger(__name__)
 
+# Number of conversations whose message history is kept in memory between turns.
+_HISTORY_CACHE_SIZE = 32
+# Strong references to fire-and-forget tasks; the event loop only keeps weak ones.
+_background_tasks: set[asyncio.Task] = set()
+# A sentence ends at a newline, or at terminal punctuation once the following whitespace arrives.
+_SENTENCE_END_RE = re.compile(r"[.!?](?=\s)|\n")
+# Upper bound on the total size of encoded images kept between turns.
+_IMAGE_CACHE_BYTES = 64 * 1024 * 1024
+
+
+def _encode_image_data_uri(path: Path) -> str:
+    mime_type, _ = mimetypes.guess_type(path.name)
+    if not mime_type:
+        mime_type = "image/png"
+    data = path.read_bytes()
+    # SIMD encoder that returns str directly, skipping the bytes -> str decode copy.
+    return f"data:{mime_type};base64,{pybase64.b64encode_as_string(data)}"
+
 
 class StreamingCoordinator:
     """Coordinates STT, LLM streaming, and TTS playback."""
 
+    def __init__(self) -> None:
+        self._history: OrderedDict[str, list[dict[str, str]]] = OrderedDict()
+        # Keyed by (path, mtime_ns, size) so a rewritten file misses the cache.
+        self._image_uris: OrderedDict[tuple[str, int, int], str] = OrderedDict()
+        self._image_uri_bytes = 0
+
+    def forget_conversation(self, conversation_id: str | None = None) -> None:
+        """Drop cached history for one conversation, or for all of them when no id is given."""
+        if conversation_id is None:
+            self._history.clear()
+        else:
+            self._history.pop(conversation_id, None)
+
     async def handle_voice_message(
         self,
         conversation_id: str,
         audio_path: Path,
         image_path: Optional[Path] = None,
         stored_audio_path: Optional[str] = None,
+        on_title: Optional[Callable[[StreamingChunk], None]] = None,
     ) -> AsyncIterator[StreamingChunk]:
         speech_service = await get_speech_service()
         transcription = await speech_service.transcribe_audio(audio_path)
@@ -56,13 +98,18 @@ class StreamingCoordinator:
             },
         )
 
-        async for chunk in self.handle_text_message(
-            conversation_id,
-            transcription,
-            image_path=image_path,
-            user_audio_path=stored_audio_path,
-        ):
-            yield chunk
+        # aclosing passes an early close straight through, so the reply's own cleanup runs immediately.
+        async with aclosing(
+            self.handle_text_message(
+                conversation_id,
+                transcription,
+                image_path=image_path,
+                user_audio_path=stored_audio_path,
+                on_title=on_title,
+            )
+        ) as reply:
+            async for chunk in reply:
+                yield chunk
 
     async def handle_text_message(
         self,
@@ -71,68 +118,198 @@ class StreamingCoordinator:
         image_path: Optional[Path] = None,
         user_audio_path: Optional[str] = None,
         stored_image_path: Optional[str] = None,
+        on_title: Optional[Callable[[StreamingChunk], None]] = None,
     ) -> AsyncIterator[StreamingChunk]:
-        user_message = await add_message(
-            conversation_id,
-            role="user",
-            content=text,
-            image_path=stored_image_path or (str(image_path) if image_path else None),
-        )
-        if user_audio_path:
-            await update_message_audio_path(user_message.id, user_audio_path)
+        """Stream the assistant's reply to ``text``.
 
-        llm = await get_llm_client()
-        messages = await self._load_messages(conversation_id)
-        llm_messages = await self._build_llm_messages(messages)
-        buffer = []
-        assistant_message_id: int | None = None
-        new_title: str | None = None
-        async for event in llm.stream_chat(llm_messages):
-            if event.get("done"):
-                break
-            if "message" in event:
-                raw_content = event["message"].get("content", "")
-                content_piece = clean_llm_text(raw_content)
-                if content_piece:
-                    buffer.append(content_piece)
-                    yield StreamingChunk(type="assistant_delta", data={"content": content_piece})
-        if buffer:
-            full_content = "".join(buffer)
-            assistant_message = await add_message(conversation_id, role="assistant", content=full_content)
-            assistant_message_id = assistant_message.id
-            new_title = await self._maybe_assign_conversation_title(
-                conversation_id,
-                messages,
-                user_message,
-                full_content,
-            )
-        else:
-            assistant_message_id = None
+        A new conversation title is generated after the stream ends and is handed to ``on_title``
+        when it is ready.
+        """
+        # Read once per turn; the helpers below get these passed in rather than looking them up again.
+        settings = get_settings()
+        media_root = get_runtime_config().media_root
+        stored_image = stored_image_path or (str(image_path) if image_path else None)
+        user_entry = NewMessage(role="user", content=text, audio_path=user_audio_path, image_path=stored_image)
+        history = await self._get_history(conversation_id)
+        # The user turn is written together with the reply below; until then it only exists locally.
+        messages = [*history, {"role": "user", "content": text, "image_path": stored_image}]
 
-        # Optionally synthesize audio response
+        llm = await get_llm_client()
         speech_service = await get_speech_service()
-        audio_path = await speech_service.synthesize_speech("".join(buffer) or "")
-        if audio_path and assistant_message_id:
-            settings = get_settings()
-            try:
-                relative_path = audio_path.relative_to(settings.media_root)
-            except ValueError:
-                relative_path = audio_path
-            normalized_path = relative_path.as_posix()
-            await update_message_audio_path(assistant_message_id, normalized_path)
-            yield StreamingChunk(type="assistant_audio", data={"audio_path": normalized_path})
+        llm_messages = await self._build_llm_messages(messages, settings, media_root)
+        buffer = StringIO()
+        # Completed sentences go to TTS while the LLM keeps streaming; ``pending`` is the unfinished tail.
+        pending = ""
+        clip_dir = speech_service.output_dir / secrets.token_hex(8)
+        tts_tasks: list[asyncio.Task[Optional[Path]]] = []
+        next_task = 0
+        clip_paths: list[Path] = []
+        persisted = False
+        merged = False
+        try:
+            async for event in llm.stream_chat(llm_messages):
+                if event.get("done"):
+                    break
+                if "message" in event:
+                    raw_content = event["message"].get("content", "")
+                    content_piece = clean_llm_text(raw_content)
+                    if content_piece:
+                        buffer.write(content_piece)
+                        yield StreamingChunk(type="assistant_delta", data={"content": content_piece})
+                        pending += content_piece
+                        sentence_end = 0
+                        for match in _SENTENCE_END_RE.finditer(pending):
+                            sentence_end = match.end()
+                        if sentence_end:
+                            self._queue_speech(speech_service, pending[:sentence_end], clip_dir, tts_tasks)
+                            pending = pending[sentence_end:]
+                # Hand clips over as soon as they are ready, but never ahead of an earlier sentence.
+                while next_task < len(tts_tasks) and tts_tasks[next_task].done():
+                    clip_path = await self._clip_result(tts_tasks[next_task])
+                    next_task += 1
+                    if clip_path is not None:
+                        yield self._audio_chunk(clip_path, len(clip_paths), media_root)
+                        clip_paths.append(clip_path)
+            full_content = buffer.getvalue()
+
+            # Save the text the client has already seen before waiting on TTS; audio is attached afterwards.
+            new_entries = [user_entry]
+            if full_content:
+                new_entries.append(NewMessage(role="assistant", content=full_content))
+            stored = await add_messages(conversation_id, new_entries)
+            persisted = True
+            self._remember(conversation_id, history, stored)
+
+            self._queue_speech(speech_service, pending, clip_dir, tts_tasks)
+            for task in tts_tasks[next_task:]:
+                clip_path = await self._clip_result(task)
+                if clip_path is not None:
+                    yield self._audio_chunk(clip_path, len(clip_paths), media_root)
+                    clip_paths.append(clip_path)
+            if clip_paths:
+                # Lets the client tell the gap between two sentences from the end of the reply.
+                yield StreamingChunk(type="assistant_audio_done", data={})
+
+            # The transcript keeps the whole reply as one file next to its per-sentence clips.
+            if clip_paths:
+                try:
+                    audio_path = await speech_service.concatenate_wavs(clip_paths, clip_dir.with_suffix(".wav"))
+                except Exception as exc:  # noqa: BLE001
+                    logger.warning("Failed to merge reply audio for %s: %s", conversation_id, exc)
+                else:
+                    await update_message_audio_path(stored[-1].id, self._media_relative(audio_path, media_root))
+                    merged = True
+        finally:
+            for task in tts_tasks:
+                task.cancel()
+            if not persisted:
+                # Keep the user's turn even when the LLM stream fails or the client goes away.
+                stored = await add_messages(conversation_id, [user_entry])
+                self._remember(conversation_id, history, stored)
+            if tts_tasks and not merged:
+                # Nothing in the transcript points at these clips, so conversation deletion would never find them.
+                await asyncio.gather(*tts_tasks, return_exceptions=True)
+                await asyncio.to_thread(shutil.rmtree, clip_dir, True)
+
+        if full_content:
+            # Naming costs another LLM round trip, so it must not hold the reply stream open.
+            title_task = asyncio.create_task(
+                self._maybe_assign_conversation_title(conversation_id, messages, text, full_content)
+            )
+            _background_tasks.add(title_task)
+            title_task.add_done_callback(_background_tasks.discard)
+            if on_title is not None:
+                title_task.add_done_callback(partial(self._deliver_title, conversation_id, on_title))
 
+    @staticmethod
+    def _deliver_title(
+        conversation_id: str,
+        on_title: Callable[[StreamingChunk], None],
+        task: asyncio.Task[str | None],
+    ) -> None:
+        if task.cancelled():
+            return
+        if (exc := task.exception()) is not None:
+            logger.warning("Conversation title assignment failed: %s", exc)
+            return
+        new_title = task.result()
         if new_title is not None:
-            yield StreamingChunk(
-                type="conversation_title",
-                data={"title": new_title, "conversation_id": conversation_id},
+            on_title(
+                StreamingChunk(
+                    type="conversation_title",
+                    data={"title": new_title, "conversation_id": conversation_id},
+                )
             )
 
+    @staticmethod
+    def _queue_speech(
+        speech_service: SpeechService,
+        text: str,
+        clip_dir: Path,
+        tts_tasks: list[asyncio.Task[Optional[Path]]],
+    ) -> None:
+        if not text.strip():
+            return
+        clip_path = clip_dir / f"{len(tts_tasks)}.wav"
+        tts_tasks.append(asyncio.create_task(speech_service.synthesize_speech(text, clip_path)))
+
+    @staticmethod
+    async def _clip_result(task: asyncio.Task[Optional[Path]]) -> Optional[Path]:
+        # A failed sentence only loses its clip; the reply text and the other clips still go through.
+        try:
+            return await task
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("Sentence synthesis failed: %s", exc)
+            return None
+
+    @classmethod
+    def _audio_chunk(cls, clip_path: Path, segment: int, media_root: Path) -> StreamingChunk:
+        # ``segment`` counts delivered clips, so the client can tell where a new reply starts.
+        return StreamingChunk(
+            type="assistant_audio",
+            data={"audio_path": cls._media_relative(clip_path, media_root), "segment": str(segment)},
+        )
+
+    @staticmethod
+    def _media_relative(path: Path, media_root: Path) -> str:
+        try:
+            relative_path = path.relative_to(media_root)
+        except ValueError:
+            relative_path = path
+        return relative_path.as_posix()
+
+    async def _get_history(self, conversation_id: str) -> list[dict[str, str]]:
+        history = self._history.get(conversation_id)
+        if history is None:
+            history = await self._load_messages(conversation_id)
+            self._cache(conversation_id, history)
+        return history
+
+    def _remember(self, conversation_id: str, history: list[dict[str, str]], stored: list[Row]) -> None:
+        # Another turn on this conversation replaced the entry mid-stream; the cache can no longer
+        # be extended safely, so the next turn reloads from the database.
+        if self._history.get(conversation_id) is not history:
+            self._history.pop(conversation_id, None)
+            return
+        updated = history + [
+            {"role": message.role, "content": message.content, "image_path": message.image_path}
+            for message in stored
+        ]
+        self._cache(conversation_id, updated)
+
+    def _cache(self, conversation_id: str, history: list[dict[str, str]]) -> None:
+        self._history[conversation_id] = history
+        self._history.move_to_end(conversation_id)
+        while len(self._history) > _HISTORY_CACHE_SIZE:
+            self._history.popitem(last=False)
+
     async def _load_messages(self, conversation_id: str) -> list[dict[str, str]]:
         db = await get_db_manager()
         async with db.session() as session:
             result = await session.execute(
-                Message.__table__.select().where(Message.conversation_id == conversation_id).order_by(Message.id)
+                select(Message.role, Message.content, Message.image_path)
+                .where(Message.conversation_id == conversation_id)
+                .order_by(Message.id)
             )
             rows = result.fetchall()
         return [
@@ -140,16 +317,31 @@ class StreamingCoordinator:
             for row in rows
         ]
 
-    async def _build_llm_messages(self, messages: list[dict[str, str]]) -> list[dict[str, object]]:
-        settings = get_settings()
+    async def _build_llm_messages(
+        self, messages: list[dict[str, str]], settings: AppSettings, media_root: Path
+    ) -> list[dict[str, object]]:
         llm_messages: list[dict[str, object]] = []
-        for message in messages:
+        # Earlier images were already seen by the model; by default only the newest user turn carries one.
+        inline_from = 0
+        resend_prior_images = settings.LLM.resend_prior_images
+        if not resend_prior_images:
+            inline_from = next(
+                (index for index in range(len(messages) - 1, -1, -1) if messages[index].get("role") == "user"),
+                len(messages),
+            )
+        for index, message in enumerate(messages):
             role = message.get("role") or "user"
             content_text = message.get("content") or ""
             image_path = message.get("image_path")
-            if image_path:
+            if image_path and index < inline_from:
+                has_text = content_text.strip() and content_text.strip() != "[image]"
+                content = content_text if has_text else "[image previously shared]"
+                llm_messages.append({"role": role, "content": content})
+            elif image_path:
                 try:
-                    data_uri = self._image_path_to_data_uri(self._resolve_image_path(str(image_path)))
+                    data_uri = self._image_path_to_data_uri(
+                        self._resolve_image_path(str(image_path), media_root), cache=resend_prior_images
+                    )
                 except FileNotFoundError:
                     logger.warning("Image not found for LLM payload: %s", image_path)
                     continue
@@ -167,32 +359,39 @@ class StreamingCoordinator:
         return llm_messages
 
     @staticmethod
-    def _resolve_image_path(image_path: str) -> Path:
-        settings = get_settings()
+    def _resolve_image_path(image_path: str, media_root: Path) -> Path:
         normalized = image_path.replace("\\", "/")
         if normalized.startswith("/media/"):
             normalized = normalized[len("/media/") :]
-        return settings.media_root / normalized
+        return media_root / normalized
 
-    @staticmethod
-    def _image_path_to_data_uri(path: Path) -> str:
-        if not path.exists():
-            raise FileNotFoundError(path)
-        mime_type, _ = mimetypes.guess_type(path.name)
-        if not mime_type:
-            mime_type = "image/png"
-        data = path.read_bytes()
-        b64 = base64.b64encode(data).decode("ascii")
-        return f"data:{mime_type};base64,{b64}"
+    def _image_path_to_data_uri(self, path: Path, *, cache: bool) -> str:
+        # Only worth caching when history images are re-sent every turn; otherwise each is encoded once.
+        if not cache:
+            return _encode_image_data_uri(path)
+        stat = path.stat()
+        key = (str(path), stat.st_mtime_ns, stat.st_size)
+        data_uri = self._image_uris.get(key)
+        if data_uri is not None:
+            self._image_uris.move_to_end(key)
+            return data_uri
+        data_uri = _encode_image_data_uri(path)
+        if len(data_uri) <= _IMAGE_CACHE_BYTES:
+            self._image_uris[key] = data_uri
+            self._image_uri_bytes += len(data_uri)
+            while self._image_uri_bytes > _IMAGE_CACHE_BYTES:
+                _, evicted = self._image_uris.popitem(last=False)
+                self._image_uri_bytes -= len(evicted)
+        return data_uri
 
     async def _maybe_assign_conversation_title(
         self,
         conversation_id: str,
         prior_messages: list[dict[str, str]],
-        user_message: Message,
+        user_text: str,
         assistant_text: str,
     ) -> str | None:
-        if not user_message.content or not assistant_text:
+        if not user_text or not assistant_text:
             return None
         if any(msg["role"] == "assistant" for msg in prior_messages if msg is not None):
             return None
@@ -201,7 +400,7 @@ class StreamingCoordinator:
             conversation = await session.get(Conversation, conversation_id)
             if conversation is None or conversation.title != "New Conversation":
                 return None
-        proposal = await get_conversation_title(user_message.content, assistant_text)
+        proposal = await get_conversation_title(user_text, assistant_text)
         if not proposal:
             return None
         updated = await rename_conversation(conversation_id, proposal)
@@ -5,8 +5,12 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Iterable
 
+import numpy as np
 import webrtcvad
 
+# Below this many whole frames there is nothing meaningful to trim, so audio is passed through untouched.
+_MIN_TRIM_FRAMES = 3
+
 
 @dataclass
 class VADConfig:
@@ -29,35 +33,32 @@ class VoiceActivityDetector:
     def config(self) -> VADConfig:
         return self._config
 
-    def trim_silence(self, pcm16: bytes) -> bytes:
-        """Return PCM audio with leading/trailing silence removed."""
-        frames = list(self._frame_generator(pcm16))
-        if not frames:
-            return pcm16
-
-        speech_flags = [self._vad.is_speech(frame, self._config.sample_rate) for frame in frames]
-
-        first_idx = None
-        for idx, flag in enumerate(speech_flags):
-            if flag:
-                first_idx = idx
-                break
-
-        if first_idx is None:
-            return b""  # Return empty if no speech is detected
-
-        last_idx = None
-        for offset, flag in enumerate(reversed(speech_flags)):
-            if flag:
-                last_idx = len(speech_flags) - offset - 1
-                break
-
-        assert last_idx is not None
-
-        start_byte = first_idx * self._frame_bytes
-        end_byte = min(len(pcm16), (last_idx + 1) * self._frame_bytes)
-        return pcm16[start_byte:end_byte]
-
-    def _frame_generator(self, pcm16: bytes) -> Iterable[bytes]:
-        for i in range(0, len(pcm16), self._frame_bytes):
-            yield pcm16[i : i + self._frame_bytes]
\ No newline at end of file
+    def trim_silence(self, pcm16: bytes | memoryview) -> memoryview:
+        """Return a view of the PCM audio with leading/trailing silence removed."""
+        view = memoryview(pcm16).cast("B")
+        frame_bytes = self._frame_bytes
+        # Only whole frames are classified; webrtcvad rejects a trailing partial frame.
+        frame_count = len(view) // frame_bytes
+        if frame_count < _MIN_TRIM_FRAMES:
+            return view
+
+        # count= sizes the flags array up front, so no intermediate list of frames or flags is built.
+        speech_flags = np.fromiter(
+            (
+                self._vad.is_speech(frame, self._config.sample_rate)
+                for frame in self._frame_generator(view, range(0, frame_count * frame_bytes, frame_bytes))
+            ),
+            dtype=np.bool_,
+            count=frame_count,
+        )
+        speech_idx = np.flatnonzero(speech_flags)
+        if speech_idx.size == 0:
+            return view[:0]  # Return empty if no speech is detected
+
+        first_idx, last_idx = int(speech_idx[0]), int(speech_idx[-1])
+        return view[first_idx * frame_bytes : (last_idx + 1) * frame_bytes]
+
+    def _frame_generator(self, view: memoryview, starts: range) -> Iterable[memoryview]:
+        # Slicing a memoryview is zero-copy; webrtcvad reads the frames through the buffer protocol.
+        for start in starts:
+            yield view[start : start + self._frame_bytes]
\ No newline at end of file
@@ -7,6 +7,7 @@ from contextlib import asynccontextmanager
 from pathlib import Path
 from typing import AsyncIterator
 
+from sqlalchemy import Connection, event
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
 
@@ -17,6 +18,32 @@ class Base(DeclarativeBase):
     """Base declarative model."""
 
 
+def _create_schema(connection: Connection) -> None:
+    Base.metadata.create_all(connection)
+    # create_all skips tables that already exist, so add indexes introduced after the first run.
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(connection, checkfirst=True)
+
+
+_SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-20000",
+    "PRAGMA mmap_size=268435456",
+)
+
+
+def _apply_pragmas(dbapi_connection, _connection_record) -> None:
+    # Only journal_mode persists in the file; the rest are per connection, so set them on every connect.
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in _SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
+
 class DatabaseManager:
     """Manages the async SQLAlchemy engine and sessions."""
 
@@ -32,11 +59,12 @@ class DatabaseManager:
         if self._engine is None:
             self._db_path.parent.mkdir(parents=True, exist_ok=True)
             self._engine = create_async_engine(self._get_database_url(), future=True)
+            event.listen(self._engine.sync_engine, "connect", _apply_pragmas)
             self._session_maker = async_sessionmaker(self._engine, expire_on_commit=False)
 
         assert self._engine is not None
         async with self._engine.begin() as conn:
-            await conn.run_sync(Base.metadata.create_all)
+            await conn.run_sync(_create_schema)
 
     async def dispose(self) -> None:
         if self._engine is not None:
@@ -60,14 +88,20 @@ class DatabaseManager:
 
 
 _db_manager: DatabaseManager | None = None
+_db_manager_lock = asyncio.Lock()
 
 
 async def get_db_manager() -> DatabaseManager:
     global _db_manager
     if _db_manager is None:
-        settings = get_settings()
-        _db_manager = DatabaseManager(settings.conversation_db_path)
-        await _db_manager.initialize()
+        # initialize() awaits, so concurrent first callers would otherwise each build an engine.
+        async with _db_manager_lock:
+            if _db_manager is None:
+                settings = get_settings()
+                manager = DatabaseManager(settings.conversation_db_path)
+                await manager.initialize()
+                # Publish only once initialized; the unlocked check above must never see a half-built one.
+                _db_manager = manager
     return _db_manager
 
 
@@ -1,6 +1,14 @@
 import re
 
 CONTROL_PATTERN = re.compile(r"<\|.*?\|>")
+# Control tokens and carriage returns are stripped first so commentary lines are seen as the LLM meant them.
+_CONTROL_OR_CR_PATTERN = re.compile(r"<\|.*?\|>|\r")
+_COMMENTARY_LINE = r"[^\S\n]*(?:assistant)?commentary to=[^\n]*"
+# Runs of commentary lines are dropped with one adjacent newline each, matching a split/filter/join.
+_COMMENTARY_LINES_PATTERN = re.compile(
+    rf"\A{_COMMENTARY_LINE}(?:\n{_COMMENTARY_LINE})*\n?|\n{_COMMENTARY_LINE}(?:\n{_COMMENTARY_LINE})*"
+)
+_BLANK_LINE_PATTERN = re.compile(r"^[^\S\n]+$", re.MULTILINE)
 
 
 def clean_llm_text(text: str) -> str:
@@ -9,20 +17,16 @@ def clean_llm_text(text: str) -> str:
     if not text:
         return ""
 
-    cleaned = CONTROL_PATTERN.sub("", text)
-    cleaned = cleaned.replace("\r", "")
+    result = text
+    # Most streamed deltas are plain words, so each regex pass only runs when it could match.
+    if "<|" in result or "\r" in result:
+        result = _CONTROL_OR_CR_PATTERN.sub("", result)
+    if "commentary to=" in result:
+        result = _COMMENTARY_LINES_PATTERN.sub("", result)
+    # Whitespace-only lines collapse to empty ones; a single-line delta only needs the isspace check.
+    if "\n" in result or result.isspace():
+        result = _BLANK_LINE_PATTERN.sub("", result)
 
-    filtered_lines: list[str] = []
-    for raw_line in cleaned.split("\n"):
-        stripped = raw_line.strip()
-        if not stripped:
-            filtered_lines.append("")
-            continue
-        if stripped.startswith("assistantcommentary to=") or stripped.startswith("commentary to="):
-            continue
-        filtered_lines.append(raw_line)
-
-    result = "\n".join(filtered_lines)
     if result.startswith("assistant"):
         result = result[len("assistant") :].lstrip(": ")
 
@@ -83,7 +83,15 @@ function handleSocketMessage(payload) {
             ui.appendAssistantDelta(payload.data.content || "");
             break;
         case "assistant_audio":
-            audio.playAudio(payload.data.audio_path);
+            // The first sentence of a reply interrupts older playback; later ones queue behind it.
+            if (payload.data.segment && payload.data.segment !== "0") {
+                audio.queueAudio(payload.data.audio_path);
+            } else {
+                audio.playAudio(payload.data.audio_path);
+            }
+            break;
+        case "assistant_audio_done":
+            audio.finishReplyAudio();
             break;
         case "conversation_title":
             state.updateConversationTitle(payload.data.conversation_id, payload.data.title);
@@ -199,7 +207,7 @@ function bindEvents() {
   });
   ui.elements.micButton.addEventListener("click", toggleRecording);
   ui.elements.stopAudioBtn.addEventListener("click", () => {
-      audio.stopAllPlayback();
+      audio.stopReply();
       audio.armHandsFreeListener(); // Re-arm after manually stopping
   });
   ui.elements.volumeSlider.addEventListener("input", (e) => audio.setPlaybackVolume(parseFloat(e.target.value)));
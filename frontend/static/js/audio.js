@@ -6,6 +6,10 @@ let mediaRecorder = null;
 let recordedChunks = [];
 let activeStream = null;
 let onRecordingStopCallback = null;
+// True while the server may still send clips for the current reply; the mic stays closed until then.
+let replyAudioPending = false;
+// Set by the Stop button; later clips of the stopped reply are dropped until the next reply starts.
+let replyStopped = false;
 
 // VAD-related variables
 let audioContext, vadSource, vadAnalyser, vadDataArray, vadAnimationFrame;
@@ -166,35 +170,70 @@ export async function playAudio(audioPath) {
     if (!state.get('settings')?.audio?.enable_voice_output) return;
     
     stopAllPlayback();
+    replyStopped = false;
+    replyAudioPending = true;
+    queueAudio(audioPath);
+}
+
+// Called once the server has sent every clip of the reply.
+export function finishReplyAudio() {
+    replyAudioPending = false;
+    // Stop already re-armed the listener for a stopped reply.
+    if (!replyStopped && state.get('audioQueue').length === 0) {
+        armHandsFreeListener();
+    }
+}
+
+// Appends a clip behind whatever is already playing; replies arrive as one clip per sentence.
+export function queueAudio(audioPath) {
+    if (!state.get('settings')?.audio?.enable_voice_output || replyStopped) return;
+
     teardownHandsFreeListener(); // Stop listening while assistant speaks
 
     const audio = new Audio(ui.makeMediaUrl(audioPath));
     audio.volume = parseFloat(ui.elements.volumeSlider.value);
-    
+    audio.onended = () => playNextInQueue(audio);
+
     state.addAudioToQueue(audio);
+    if (state.get('audioQueue').length === 1) {
+        startPlayback(audio);
+    }
+}
 
-    audio.onended = () => {
-        state.removeAudioFromQueue(audio);
+function playNextInQueue(finished) {
+    state.removeAudioFromQueue(finished);
+    const next = state.get('audioQueue')[0];
+    if (next) {
+        startPlayback(next);
+    } else if (!replyAudioPending) {
         // **FIXED**: Call the function to re-arm the listener.
         armHandsFreeListener();
-    };
+    }
+}
 
+async function startPlayback(audio) {
     try {
         await audio.play();
     } catch (error) {
         console.error("Audio playback failed:", error);
         ui.showAlert("Audio playback failed.", "error");
-        state.removeAudioFromQueue(audio);
-        // Also try to re-arm on failure
-        armHandsFreeListener();
+        // Skip the broken clip; the listener re-arms once the reply's queue drains.
+        playNextInQueue(audio);
     }
 }
 
 export function stopAllPlayback() {
+    replyAudioPending = false;
     state.clearAudioQueue();
     ui.setChatStatus("Idle");
 }
 
+// Stops the reply being played, including clips of it that have not arrived yet.
+export function stopReply() {
+    replyStopped = true;
+    stopAllPlayback();
+}
+
 export function setPlaybackVolume(volume) {
     state.get('audioQueue').forEach(audio => {
         audio.volume = volume;
@@ -2,6 +2,7 @@ import { WEBSOCKET_URL } from './config.js';
 
 let socket = null;
 let messageHandler = null;
+const textDecoder = new TextDecoder();
 
 function ensureSocket() {
   return new Promise((resolve, reject) => {
@@ -21,11 +22,14 @@ function ensureSocket() {
     }
 
     socket = new WebSocket(WEBSOCKET_URL);
+    // The backend sends JSON as binary frames; decode them synchronously.
+    socket.binaryType = "arraybuffer";
 
     socket.onmessage = (event) => {
       if (messageHandler) {
         try {
-          const payload = JSON.parse(event.data);
+          const raw = typeof event.data === "string" ? event.data : textDecoder.decode(event.data);
+          const payload = JSON.parse(raw);
           messageHandler(payload);
         } catch (error) {
           console.error("Failed to parse WebSocket message:", error);